@@ -1,282 +1,491 @@
-"""
-MVU VRAM Overlay Application.
-
-Этот модуль представляет собой независимое приложение PyQt6, отображающее
-потребление VRAM поверх всех окон. Предназначен для запуска как подпроцесс
-из ComfyUI, но может работать и автономно.
-
-Author: MVU
-License: MIT
-"""
-
-import sys
-import time
-import logging
-import argparse
-import psutil
-from typing import Optional
-
-from pynvml import (
-    nvmlInit,
-    nvmlShutdown,
-    nvmlDeviceGetHandleByIndex,
-    nvmlDeviceGetMemoryInfo,
-    NVMLError
-)
-
-from PyQt6.QtWidgets import QApplication, QWidget, QLabel
-from PyQt6.QtCore import Qt, QTimer, QPoint, pyqtSlot, QObject
-from PyQt6.QtGui import QFont, QColor, QPalette, QMouseEvent
-
-
-# --- КОНФИГУРАЦИЯ (SETTINGS) ---
-class AppConfig:
-    """Конфигурация приложения и константы."""
-    # Визуальные настройки
-    VRAM_TEXT_COLOR: str = "#32CD32"
-    FONT_FAMILY: str = "Segoe UI"
-    FONT_SIZE: int = 14
-    FONT_WEIGHT: QFont.Weight = QFont.Weight.Bold
-    
-    # Позиционирование
-    RIGHT_MARGIN: int = 130
-    BOTTOM_MARGIN: int = 85
-    
-    # Логика обновления
-    POLL_INTERVAL_MS: int = 500
-    PROCESS_CHECK_INTERVAL_MS: int = 3000
-    
-    # Имя процесса для мониторинга (если PID не передан)
-    TARGET_PROCESS_NAME: str = "python"
-    TARGET_CMDLINE_KEYWORD: str = "main.py"
-    
-    # Логирование
-    LOG_FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-
-
-# --- НАСТРОЙКА ЛОГИРОВАНИЯ ---
-logging.basicConfig(level=logging.INFO, format=AppConfig.LOG_FORMAT)
-logger = logging.getLogger("MVU_Overlay")
-
-
-# --- MODEL (Работа с данными) ---
-class VramMonitorModel:
-    """
-    Model: Отвечает за взаимодействие с драйвером NVIDIA через NVML.
-    """
-    def __init__(self) -> None:
-        self._handle = None
-        self._initialized: bool = False
-
-    def initialize(self) -> None:
-        """Инициализирует NVML и получает дескриптор устройства."""
-        try:
-            nvmlInit()
-            # Берем первую GPU (index 0). При необходимости можно расширить.
-            self._handle = nvmlDeviceGetHandleByIndex(0)
-            self._initialized = True
-            logger.info("NVML успешно инициализирован.")
-        except NVMLError as error:
-            logger.error(f"Ошибка инициализации NVML: {error}")
-            self._initialized = False
-
-    def get_free_memory_mb(self) -> Optional[int]:
-        """Возвращает количество свободной VRAM в мегабайтах."""
-        if not self._initialized or not self._handle:
-            return None
-
-        try:
-            mem_info = nvmlDeviceGetMemoryInfo(self._handle)
-            return mem_info.free // (1024 ** 2)
-        except NVMLError as error:
-            logger.warning(f"Ошибка чтения памяти GPU: {error}")
-            return None
-
-    def shutdown(self) -> None:
-        """Корректно завершает работу с NVML."""
-        if self._initialized:
-            try:
-                nvmlShutdown()
-                logger.info("NVML ресурсы освобождены.")
-            except NVMLError as error:
-                logger.error(f"Ошибка при завершении NVML: {error}")
-
-
-class ProcessMonitorModel:
-    """
-    Model: Отвечает за проверку существования родительского процесса ComfyUI.
-    """
-    def __init__(self, target_pid: Optional[int] = None) -> None:
-        self.target_pid = target_pid
-
-    def is_alive(self) -> bool:
-        """
-        Проверяет, жив ли целевой процесс.
-        Если PID передан явно - проверяет его.
-        Если нет - ищет процесс по сигнатуре командной строки.
-        """
-        if self.target_pid:
-            return psutil.pid_exists(self.target_pid)
-        
-        # Fallback логика (поиск по имени)
-        for proc in psutil.process_iter(['name', 'cmdline']):
-            try:
-                if (AppConfig.TARGET_PROCESS_NAME in proc.info['name'].lower() and 
-                    proc.info['cmdline'] and 
-                    AppConfig.TARGET_CMDLINE_KEYWORD in proc.info['cmdline']):
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        return False
-
-
-# --- VIEW (Графический интерфейс) ---
-class VramOverlayView(QWidget):
-    """
-    View: Отвечает только за отображение данных на экране.
-    """
-    def __init__(self) -> None:
-        super().__init__()
-        self._setup_ui()
-        self._old_pos: Optional[QPoint] = None
-
-    def _setup_ui(self) -> None:
-        """Настройка свойств окна и виджетов."""
-        # Флаги окна: без рамок, поверх всех окон, не отображается в панели задач (Tool)
-        flags = (
-            Qt.WindowType.FramelessWindowHint |
-            Qt.WindowType.WindowStaysOnTopHint |
-            Qt.WindowType.Tool |
-            Qt.WindowType.WindowTransparentForInput  # Пропускать клики (по умолчанию)
-        )
-        self.setWindowFlags(flags)
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-
-        # Метка с текстом
-        self.label = QLabel(self)
-        self.label.setFont(QFont(AppConfig.FONT_FAMILY, 
-                                 AppConfig.FONT_SIZE, 
-                                 AppConfig.FONT_WEIGHT))
-        
-        palette = self.label.palette()
-        palette.setColor(QPalette.ColorRole.WindowText, QColor(AppConfig.VRAM_TEXT_COLOR))
-        self.label.setPalette(palette)
-        
-        self.update_text("Init...")
-
-    def update_text(self, text: str) -> None:
-        """Обновляет текст метки и подгоняет размер окна."""
-        self.label.setText(text)
-        self.label.adjustSize()
-        self.adjustSize()
-
-    def set_position(self) -> None:
-        """Устанавливает начальную позицию (нижний правый угол)."""
-        screen = QApplication.primaryScreen()
-        if screen:
-            geo = screen.geometry()
-            self.move(
-                geo.width() - self.width() - AppConfig.RIGHT_MARGIN,
-                geo.height() - self.height() - AppConfig.BOTTOM_MARGIN
-            )
-
-    # --- Обработка перетаскивания (для режима Interactive, если потребуется) ---
-    # Для активации перетаскивания нужно убрать флаг WindowTransparentForInput
-    def mousePressEvent(self, event: QMouseEvent) -> None:
-        if event.button() == Qt.MouseButton.LeftButton:
-            self._old_pos = event.globalPosition().toPoint()
-
-    def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        if self._old_pos is not None:
-            delta = QPoint(event.globalPosition().toPoint() - self._old_pos)
-            self.move(self.x() + delta.x(), self.y() + delta.y())
-            self._old_pos = event.globalPosition().toPoint()
-
-    def mouseReleaseEvent(self, event: QMouseEvent) -> None:
-        if event.button() == Qt.MouseButton.LeftButton:
-            self._old_pos = None
-
-
-# --- CONTROLLER (Управление логикой) ---
-class OverlayController(QObject):
-    """
-    Controller: Связывает Model и View, управляет таймерами.
-    Наследуется от QObject для корректной работы сигналов и слотов.
-    """
-    def __init__(self, 
-                 vram_model: VramMonitorModel, 
-                 process_model: ProcessMonitorModel, 
-                 view: VramOverlayView) -> None:
-        super().__init__()
-        self.vram_model = vram_model
-        self.process_model = process_model
-        self.view = view
-
-        # Таймер обновления VRAM
-        self.vram_timer = QTimer(self)
-        self.vram_timer.timeout.connect(self._update_vram)
-        self.vram_timer.start(AppConfig.POLL_INTERVAL_MS)
-
-        # Таймер проверки процесса
-        self.process_timer = QTimer(self)
-        self.process_timer.timeout.connect(self._check_process_alive)
-        self.process_timer.start(AppConfig.PROCESS_CHECK_INTERVAL_MS)
-
-        # Инициализация
-        self.vram_model.initialize()
-        self.view.set_position()
-        self.view.show()
-        
-        # Первичное обновление
-        self._update_vram()
-
-    @pyqtSlot()
-    def _update_vram(self) -> None:
-        """Запрашивает данные у модели и передает их в вид."""
-        free_mb = self.vram_model.get_free_memory_mb()
-        if free_mb is not None:
-            self.view.update_text(f"VRAM: {free_mb} MB")
-        else:
-            self.view.update_text("VRAM: Err")
-
-    @pyqtSlot()
-    def _check_process_alive(self) -> None:
-        """Проверяет, жив ли ComfyUI. Если нет — закрывает оверлей."""
-        if not self.process_model.is_alive():
-            logger.info("Родительский процесс не найден. Завершение работы оверлея.")
-            QApplication.quit()
-
-    def cleanup(self) -> None:
-        """Очистка ресурсов перед выходом."""
-        self.vram_timer.stop()
-        self.process_timer.stop()
-        self.vram_model.shutdown()
-
-
-# --- ТОЧКА ВХОДА (MAIN) ---
-def main() -> None:
-    """Запуск приложения."""
-    parser = argparse.ArgumentParser(description="MVU VRAM Overlay for ComfyUI")
-    parser.add_argument("--pid", type=int, help="PID процесса ComfyUI для мониторинга", default=None)
-    args = parser.parse_args()
-
-    app = QApplication(sys.argv)
-    
-    # Инициализация компонентов MVC
-    vram_model = VramMonitorModel()
-    process_model = ProcessMonitorModel(target_pid=args.pid)
-    view = VramOverlayView()
-    
-    # Контроллер (теперь корректно наследуется от QObject)
-    controller = OverlayController(vram_model, process_model, view)
-    
-    # Запуск цикла событий
-    exit_code = app.exec()
-    
-    # Завершение
-    controller.cleanup()
-    sys.exit(exit_code)
-
-
-if __name__ == "__main__":
-    main()
+"""
+MVU VRAM Overlay Application.
+
+Этот модуль представляет собой независимое приложение PyQt6, отображающее
+потребление VRAM поверх всех окон. Предназначен для запуска как подпроцесс
+из ComfyUI, но может работать и автономно.
+
+Author: MVU
+License: MIT
+"""
+
+import os
+import sys
+import time
+import atexit
+import logging
+from typing import Optional
+
+# Тяжелые зависимости (pynvml, psutil) импортируются лениво при первом
+# использовании — см. _init_nvml() и ProcessMonitorModel.is_alive(). Это
+# сокращает холодный старт подпроцесса. PyQt6 остается на уровне модуля:
+# приложение само является Qt-приложением, и все классы ниже наследуются
+# от Qt-типов.
+from PyQt6.QtWidgets import QApplication, QWidget, QLabel
+from PyQt6.QtCore import (
+    Qt, QTimer, QThread, QSocketNotifier, pyqtSignal, pyqtSlot, QObject
+)
+from PyQt6.QtGui import QFont
+
+
+# --- КОНФИГУРАЦИЯ (SETTINGS) ---
+class AppConfig:
+    """Конфигурация приложения и константы."""
+    # Визуальные настройки
+    VRAM_TEXT_COLOR: str = "#32CD32"
+    FONT_FAMILY: str = "Segoe UI"
+    FONT_SIZE: int = 14
+    FONT_WEIGHT: QFont.Weight = QFont.Weight.Bold
+    
+    # Позиционирование
+    RIGHT_MARGIN: int = 130
+    BOTTOM_MARGIN: int = 85
+    
+    # Логика обновления.
+    # Реальный интервал опроса вычисляется в VramMonitorModel.initialize()
+    # по фактическому периоду обновления счетчиков NVML; эти значения —
+    # границы и запасной вариант.
+    DEFAULT_POLL_INTERVAL_MS: int = 500
+    MIN_POLL_INTERVAL_MS: int = 200
+    POLL_PROBE_DURATION_S: float = 0.2
+    PROCESS_CHECK_INTERVAL_MS: int = 3000
+
+    # Логирование
+    LOG_FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    # Каждый N-й повторный сбой чтения памяти поднимается до WARNING;
+    # остальные уходят в DEBUG, чтобы не грузить I/O в цикле опроса.
+    NVML_WARN_EVERY_N: int = 20
+
+    # Предел кэша готовых строк "VRAM: N MB" в контроллере.
+    TEXT_CACHE_SIZE: int = 256
+
+
+# --- НАСТРОЙКА ЛОГИРОВАНИЯ ---
+logging.basicConfig(level=logging.INFO, format=AppConfig.LOG_FORMAT)
+logger = logging.getLogger("MVU_Overlay")
+
+
+# --- ИНИЦИАЛИЗАЦИЯ NVML (лениво, один раз на процесс) ---
+# nvmlInit/nvmlShutdown — самые дорогие вызовы NVML, поэтому выполняем их
+# ровно один раз за время жизни процесса, а не на каждую сессию оверлея.
+# Импорт pynvml тоже отложен до первого обращения модели. Освобождение
+# ресурсов гарантируется через atexit.
+_NVML_READY: bool = False
+_NVML_ATTEMPTED: bool = False
+_NVML_HANDLE = None
+_NVML_ERROR: type = Exception  # заменяется на NVMLError после импорта pynvml
+_NVML_CLOCK_SM: Optional[int] = None
+_nvml_get_memory_info = None
+_nvml_get_clock_info = None
+
+
+def _init_nvml() -> None:
+    """Однократный ленивый импорт pynvml и инициализация NVML."""
+    global _NVML_READY, _NVML_ATTEMPTED, _NVML_HANDLE, _NVML_ERROR
+    global _NVML_CLOCK_SM, _nvml_get_memory_info, _nvml_get_clock_info
+
+    if _NVML_ATTEMPTED:
+        return
+    _NVML_ATTEMPTED = True
+
+    from pynvml import (
+        nvmlInit,
+        nvmlShutdown,
+        nvmlDeviceGetHandleByIndex,
+        nvmlDeviceGetMemoryInfo,
+        nvmlDeviceGetClockInfo,
+        NVML_CLOCK_SM,
+        NVMLError
+    )
+
+    _NVML_ERROR = NVMLError
+    _NVML_CLOCK_SM = NVML_CLOCK_SM
+    _nvml_get_clock_info = nvmlDeviceGetClockInfo
+
+    _nvml_get_memory_info = nvmlDeviceGetMemoryInfo
+
+    try:
+        nvmlInit()
+        # Берем первую GPU (index 0). При необходимости можно расширить.
+        _NVML_HANDLE = nvmlDeviceGetHandleByIndex(0)
+        _NVML_READY = True
+        atexit.register(nvmlShutdown)
+
+        # Предпочитаем v2-вариант запроса памяти: он чуть дешевле (без
+        # поправки на deprecated reserved-память) и точнее на новых
+        # драйверах. В nvidia-ml-py отдельной функции для него нет — v2
+        # запрашивается через kwarg version= у nvmlDeviceGetMemoryInfo.
+        # Пробный вызов проверяет, что и биндинг (kwarg), и драйвер его
+        # поддерживают; иначе остаемся на v1.
+        try:
+            from pynvml import nvmlMemory_v2
+
+            def _get_memory_info_v2(handle, _version=nvmlMemory_v2):
+                return nvmlDeviceGetMemoryInfo(handle, version=_version)
+
+            _get_memory_info_v2(_NVML_HANDLE)
+            _nvml_get_memory_info = _get_memory_info_v2
+        except (ImportError, TypeError, NVMLError):
+            pass
+
+        logger.info("NVML успешно инициализирован.")
+    except NVMLError as error:
+        logger.error("Ошибка инициализации NVML: %s", error)
+
+
+# --- MODEL (Работа с данными) ---
+class VramMonitorModel:
+    """
+    Model: Отвечает за взаимодействие с драйвером NVIDIA через NVML.
+    """
+    def __init__(self) -> None:
+        # Первое создание модели триггерит ленивый импорт и nvmlInit;
+        # дальше просто захватываем уже готовый дескриптор.
+        _init_nvml()
+        self._handle = _NVML_HANDLE
+        self._initialized: bool = _NVML_READY
+        self._update_period_ms: int = AppConfig.DEFAULT_POLL_INTERVAL_MS
+        self._free_cached: Optional[int] = None
+        self._warn_count: int = 0
+
+    def initialize(self) -> None:
+        """Прогревает NVML и замеряет период обновления счетчиков."""
+        if not self._initialized:
+            return
+        # Прогрев: на WSL2 первый вызов NVML после простоя может упасть с
+        # NVML_ERROR_UNKNOWN. Холостой запрос частоты SM снимает эту
+        # однократную ошибку до первого реального опроса памяти.
+        try:
+            _nvml_get_clock_info(self._handle, _NVML_CLOCK_SM)
+        except _NVML_ERROR:
+            pass
+        self._update_period_ms = self._measure_update_period_ms()
+
+    def _measure_update_period_ms(self) -> int:
+        """
+        Оценивает период обновления счетчиков памяти NVML.
+
+        Драйвер обновляет значения памяти не чаще собственного внутреннего
+        периода (десятки-сотни мс), поэтому опрашивать чаще бессмысленно.
+        Коротким плотным опросом замеряем, как долго значение `free`
+        остается неизменным, и подгоняем интервал таймера под это.
+        """
+        try:
+            last_free = _nvml_get_memory_info(self._handle).free
+            start = time.perf_counter()
+            while (time.perf_counter() - start) < AppConfig.POLL_PROBE_DURATION_S:
+                if _nvml_get_memory_info(self._handle).free != last_free:
+                    elapsed_ms = int((time.perf_counter() - start) * 1000)
+                    return max(AppConfig.MIN_POLL_INTERVAL_MS, elapsed_ms)
+        except _NVML_ERROR as error:
+            logger.warning("Не удалось замерить период обновления NVML: %s", error)
+        # Значение не менялось за время замера — остаемся на значении по умолчанию.
+        return AppConfig.DEFAULT_POLL_INTERVAL_MS
+
+    def get_free_memory_mb(self) -> Optional[int]:
+        """Возвращает количество свободной VRAM в мегабайтах."""
+        if not self._initialized or not self._handle:
+            return None
+
+        try:
+            # Сдвиг вместо деления: байты -> мегабайты без загрузки константы.
+            self._free_cached = _nvml_get_memory_info(self._handle).free >> 20
+            self._warn_count = 0
+            return self._free_cached
+        except _NVML_ERROR as error:
+            # Сбой может повторяться с частотой опроса (например, на WSL2) —
+            # шумим WARNING лишь изредка, остальное в DEBUG.
+            if self._warn_count % AppConfig.NVML_WARN_EVERY_N == 0:
+                logger.warning("Ошибка чтения памяти GPU: %s", error)
+            else:
+                logger.debug("Ошибка чтения памяти GPU: %s", error)
+            self._warn_count += 1
+            # Единичный транзиентный сбой (типично для WSL2) не должен
+            # мигать "Err" в интерфейсе — отдаем последнее удачное значение.
+            return self._free_cached
+
+    def shutdown(self) -> None:
+        """Завершение NVML выполняется через atexit на уровне модуля."""
+
+
+class ProcessMonitorModel:
+    """
+    Model: Отвечает за проверку существования родительского процесса ComfyUI.
+    """
+    def __init__(self, target_pid: int) -> None:
+        self.target_pid = target_pid
+
+        # На Linux 5.3+ берем pidfd: дескриптор становится читаемым ровно
+        # в момент смерти процесса, так что ожидание его в цикле событий
+        # (QSocketNotifier) полностью заменяет периодический опрос.
+        self.pidfd: Optional[int] = None
+        if hasattr(os, "pidfd_open"):
+            try:
+                self.pidfd = os.pidfd_open(target_pid)
+            except OSError:
+                self.pidfd = None
+
+    def is_alive(self) -> bool:
+        """
+        Проверяет, жив ли целевой процесс по его PID.
+
+        pid_exists — один системный вызов (kill(pid, 0) на Linux,
+        OpenProcess на Windows), в отличие от полного перебора процессов.
+        """
+        # Ленивый импорт: после первого вызова это лишь поиск в sys.modules.
+        import psutil
+        return psutil.pid_exists(self.target_pid)
+
+
+class VramPollerThread(QThread):
+    """
+    Рабочий поток опроса NVML.
+
+    Вызовы NVML могут непредсказуемо блокироваться на десятки миллисекунд
+    при конкуренции за драйвер; выполняя их вне главного потока Qt, мы
+    гарантируем отзывчивость интерфейса. GIL отпускается внутри C-вызова
+    pynvml, поэтому GUI-поток работает свободно. Сигналы доставляются в
+    главный поток через очередь событий Qt.
+    """
+    free_mb_changed = pyqtSignal(int)
+    read_failed = pyqtSignal()
+
+    def __init__(self, vram_model: VramMonitorModel) -> None:
+        super().__init__()
+        self.vram_model = vram_model
+        self._running: bool = True
+
+    def run(self) -> None:
+        """Цикл опроса: эмитит сигнал только при изменении значения."""
+        interval_s = max(
+            AppConfig.MIN_POLL_INTERVAL_MS, self.vram_model._update_period_ms
+        ) / 1000.0
+        last_free_mb: Optional[int] = None
+        was_err = False
+
+        while self._running:
+            free_mb = self.vram_model.get_free_memory_mb()
+            if free_mb is not None:
+                if free_mb != last_free_mb:
+                    last_free_mb = free_mb
+                    was_err = False
+                    self.free_mb_changed.emit(free_mb)
+            elif not was_err:
+                last_free_mb = None
+                was_err = True
+                self.read_failed.emit()
+            time.sleep(interval_s)
+
+    def stop(self) -> None:
+        """Останавливает цикл и дожидается завершения потока."""
+        self._running = False
+        self.wait()
+
+
+# --- VIEW (Графический интерфейс) ---
+class VramOverlayView(QWidget):
+    """
+    View: Отвечает только за отображение данных на экране.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self._setup_ui()
+
+        # Кэшируем геометрию экрана, чтобы не ходить к оконной системе
+        # на каждом вызове set_position. Подписка на geometryChanged
+        # сохраняет корректность при смене разрешения/мониторов.
+        self._screen_geo = None
+        screen = QApplication.primaryScreen()
+        if screen:
+            self._screen_geo = screen.geometry()
+            screen.geometryChanged.connect(self._on_screen_geometry_changed)
+
+    def _on_screen_geometry_changed(self, geometry) -> None:
+        """Обновляет кэшированную геометрию при изменении экрана."""
+        self._screen_geo = geometry
+
+    def _setup_ui(self) -> None:
+        """Настройка свойств окна и виджетов."""
+        # Флаги окна: без рамок, поверх всех окон, не отображается в панели задач (Tool)
+        flags = (
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool |
+            Qt.WindowType.WindowDoesNotAcceptFocus |  # Никогда не забираем фокус
+            Qt.WindowType.WindowTransparentForInput  # Пропускать клики (по умолчанию)
+        )
+        self.setWindowFlags(flags)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        # Не даем Qt заливать фон перед paintEvent — меньше работы композитору.
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
+
+        # Метка с текстом
+        self.label = QLabel(self)
+        self.label.setFont(QFont(AppConfig.FONT_FAMILY,
+                                 AppConfig.FONT_SIZE,
+                                 AppConfig.FONT_WEIGHT))
+
+        # Цвет через стилевую таблицу вместо копии палитры: Qt кэширует
+        # отрисованный стиль между перерисовками.
+        self.label.setStyleSheet(
+            f"color: {AppConfig.VRAM_TEXT_COLOR}; background: transparent;"
+        )
+        # PlainText: setText не прогоняет строку через разбор rich-text.
+        self.label.setTextFormat(Qt.TextFormat.PlainText)
+
+        self.update_text("Init...")
+
+    def update_text(self, text: str) -> None:
+        """Обновляет текст метки и подгоняет размер окна."""
+        # Полупрозрачное окно перерисовывается композитором на каждый
+        # setText — пропускаем кадр, если содержимое не изменилось.
+        if text == self.label.text():
+            return
+        self.label.setText(text)
+        self.label.adjustSize()
+        self.adjustSize()
+
+    def set_position(self) -> None:
+        """Устанавливает начальную позицию (нижний правый угол)."""
+        geo = self._screen_geo
+        if geo:
+            self.move(
+                geo.width() - self.width() - AppConfig.RIGHT_MARGIN,
+                geo.height() - self.height() - AppConfig.BOTTOM_MARGIN
+            )
+
+    # Обработчики мыши намеренно не переопределены: окно создается с флагом
+    # WindowTransparentForInput, поэтому перетаскивание недостижимо, а каждый
+    # Python-оверрайд добавлял бы диспетчеризацию на любое событие мыши,
+    # которое оконный менеджер все же доставит.
+
+
+# --- CONTROLLER (Управление логикой) ---
+class OverlayController(QObject):
+    """
+    Controller: Связывает Model и View, управляет таймерами.
+    Наследуется от QObject для корректной работы сигналов и слотов.
+    """
+    def __init__(self, 
+                 vram_model: VramMonitorModel, 
+                 process_model: ProcessMonitorModel, 
+                 view: VramOverlayView) -> None:
+        super().__init__()
+        self.vram_model = vram_model
+        self.process_model = process_model
+        self.view = view
+
+        # Кэш готовых строк по значению free_mb: в установившемся режиме
+        # значение колеблется в узком диапазоне, и повторное форматирование
+        # лишь плодит аллокации. FIFO-вытеснение при переполнении.
+        self._text_cache: dict[int, str] = {}
+
+        # Инициализация модели до запуска потока: интервал опроса
+        # подстраивается под замеренный период обновления NVML.
+        self.vram_model.initialize()
+
+        # Опрос NVML уходит в рабочий поток, чтобы не блокировать главный
+        # поток Qt на вызовах драйвера. Сигналы приходят уже отфильтрованными
+        # (только при изменении значения), поэтому здесь лишь обновляем вид.
+        self.poller = VramPollerThread(self.vram_model)
+        self.poller.free_mb_changed.connect(self._on_free_mb_changed)
+        self.poller.read_failed.connect(self._on_read_failed)
+        self.poller.start()
+
+        # Проверка процесса: при наличии pidfd (Linux 5.3+) уведомление о
+        # смерти родителя приходит от ядра ровно один раз — периодический
+        # опрос не нужен. Иначе остается таймер с psutil.pid_exists.
+        self.process_timer: Optional[QTimer] = None
+        self._pidfd_notifier: Optional[QSocketNotifier] = None
+        if self.process_model.pidfd is not None:
+            self._pidfd_notifier = QSocketNotifier(
+                self.process_model.pidfd, QSocketNotifier.Type.Read, self
+            )
+            self._pidfd_notifier.activated.connect(self._on_parent_died)
+        else:
+            self.process_timer = QTimer(self)
+            self.process_timer.timeout.connect(self._check_process_alive)
+            self.process_timer.start(AppConfig.PROCESS_CHECK_INTERVAL_MS)
+
+        self.view.set_position()
+        self.view.show()
+
+    @pyqtSlot(int)
+    def _on_free_mb_changed(self, free_mb: int) -> None:
+        """Получает новое значение из потока опроса и передает его в вид."""
+        text = self._text_cache.get(free_mb)
+        if text is None:
+            if len(self._text_cache) >= AppConfig.TEXT_CACHE_SIZE:
+                # FIFO: dict сохраняет порядок вставки.
+                del self._text_cache[next(iter(self._text_cache))]
+            text = self._text_cache.setdefault(free_mb, f"VRAM: {free_mb} MB")
+        self.view.update_text(text)
+
+    @pyqtSlot()
+    def _on_read_failed(self) -> None:
+        """Показывает индикатор ошибки при сбое чтения NVML."""
+        self.view.update_text("VRAM: Err")
+
+    @pyqtSlot()
+    def _on_parent_died(self) -> None:
+        """Срабатывает от pidfd в момент смерти ComfyUI."""
+        self._pidfd_notifier.setEnabled(False)
+        logger.info("Родительский процесс завершился. Завершение работы оверлея.")
+        QApplication.quit()
+
+    def _check_process_alive(self) -> None:
+        """Проверяет, жив ли ComfyUI. Если нет — закрывает оверлей."""
+        if not self.process_model.is_alive():
+            logger.info("Родительский процесс не найден. Завершение работы оверлея.")
+            QApplication.quit()
+
+    def cleanup(self) -> None:
+        """Очистка ресурсов перед выходом."""
+        if self.process_timer is not None:
+            self.process_timer.stop()
+        if self._pidfd_notifier is not None:
+            self._pidfd_notifier.setEnabled(False)
+        self.poller.stop()
+        self.vram_model.shutdown()
+
+
+# --- ТОЧКА ВХОДА (MAIN) ---
+def _parse_pid_arg() -> int:
+    """
+    Разбирает обязательный аргумент --pid вручную.
+
+    argparse тянет за собой gettext/re и строит полный парсер ради одного
+    целого числа — для подпроцесса, стартующего на каждой сессии ComfyUI,
+    это лишние десятки мс до появления окна.
+    """
+    try:
+        return int(sys.argv[sys.argv.index("--pid") + 1])
+    except (ValueError, IndexError):
+        sys.stderr.write("Использование: mvu_overlay_app.py --pid <PID ComfyUI>\n")
+        sys.exit(2)
+
+
+def main() -> None:
+    """Запуск приложения."""
+    target_pid = _parse_pid_arg()
+
+    app = QApplication(sys.argv)
+
+    # Инициализация компонентов MVC
+    vram_model = VramMonitorModel()
+    process_model = ProcessMonitorModel(target_pid=target_pid)
+    view = VramOverlayView()
+    
+    # Контроллер (теперь корректно наследуется от QObject)
+    controller = OverlayController(vram_model, process_model, view)
+    
+    # Запуск цикла событий
+    exit_code = app.exec()
+    
+    # Завершение
+    controller.cleanup()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
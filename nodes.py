@@ -1,159 +1,194 @@
-"""
-MVU VRAM Overlay Node for ComfyUI.
-
-Этот модуль содержит определение пользовательского узла (Custom Node) для ComfyUI,
-который управляет жизненным циклом внешнего процесса оверлея VRAM.
-
-Архитектура:
-- OverlayProcessManager (Singleton): Управляет subprocess (запуск/остановка).
-- MVU_VramOverlay (Node): Интерфейс для ComfyUI.
-
-Author: MVU
-License: MIT
-"""
-
-import os
-import sys
-import subprocess
-import logging
-from typing import Optional, Tuple, Dict, Any
-
-# Настройка логгера для модуля
-logger = logging.getLogger("MVU.Nodes")
-
-
-class OverlayProcessManager:
-    """
-    Менеджер процесса оверлея (Singleton).
-    Отвечает за запуск и остановку внешнего скрипта mvu_overlay_app.py.
-    Гарантирует существование только одного экземпляра оверлея.
-    """
-    _instance: Optional['OverlayProcessManager'] = None
-    _process: Optional[subprocess.Popen] = None
-
-    def __new__(cls) -> 'OverlayProcessManager':
-        if cls._instance is None:
-            cls._instance = super(OverlayProcessManager, cls).__new__(cls)
-            logger.debug("OverlayProcessManager initialized.")
-        return cls._instance
-
-    @property
-    def is_running(self) -> bool:
-        """Проверяет, запущен ли процесс и активен ли он."""
-        if self._process is None:
-            return False
-        
-        # poll() возвращает None, если процесс еще работает
-        if self._process.poll() is None:
-            return True
-        
-        return False
-
-    def start_overlay(self) -> None:
-        """Запускает скрипт оверлея как подпроцесс."""
-        if self.is_running:
-            logger.info("Оверлей уже запущен. Пропуск запуска.")
-            return
-
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        script_path = os.path.join(current_dir, "mvu_overlay_app.py")
-
-        if not os.path.exists(script_path):
-            logger.error(f"Файл скрипта не найден: {script_path}")
-            return
-
-        # Получаем PID текущего процесса (ComfyUI), чтобы передать его оверлею
-        current_pid = os.getpid()
-
-        try:
-            # Используем тот же интерпретатор Python, который запустил ComfyUI
-            cmd = [sys.executable, script_path, "--pid", str(current_pid)]
-            
-            # Запускаем процесс.
-            # subprocess.DETACHED или creationflags могут понадобиться в будущем для скрытия консоли,
-            # но для PyQt приложения, запускаемого как скрипт, стандартного Popen достаточно.
-            self._process = subprocess.Popen(
-                cmd,
-                cwd=current_dir,
-                # stdout/stderr можно перенаправить в subprocess.PIPE для отладки,
-                # но пока оставим None, чтобы видеть вывод в основной консоли ComfyUI (или скрыть его).
-            )
-            logger.info(f"Оверлей VRAM запущен (PID: {self._process.pid})")
-            
-        except OSError as e:
-            logger.error(f"Не удалось запустить процесс оверлея: {e}")
-
-    def stop_overlay(self) -> None:
-        """Останавливает процесс оверлея."""
-        if self.is_running and self._process:
-            logger.info("Остановка оверлея...")
-            self._process.terminate()
-            try:
-                # Ждем корректного завершения 2 секунды
-                self._process.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                logger.warning("Оверлей не ответил на terminate, принудительное завершение (kill).")
-                self._process.kill()
-            
-            self._process = None
-            logger.info("Оверлей остановлен.")
-        else:
-            logger.debug("Попытка остановки неактивного оверлея.")
-
-
-class MVU_VramOverlay:
-    """
-    ComfyUI Node: MVU VRAM Overlay
-    
-    Узел управления отображением использования видеопамяти.
-    Позволяет включать и отключать оверлей прямо из workflow.
-    """
-
-    def __init__(self) -> None:
-        self.manager = OverlayProcessManager()
-
-    @classmethod
-    def INPUT_TYPES(cls) -> Dict[str, Any]:
-        """Определение входных параметров узла."""
-        return {
-            "required": {
-                "enabled": ("BOOLEAN", {"default": True, "label": "Enable Overlay"}),
-                # mode можно добавить в будущем для переключения стилей
-            }
-        }
-
-    RETURN_TYPES: Tuple[str] = ("BOOLEAN",)
-    RETURN_NAMES: Tuple[str] = ("enabled",)
-    FUNCTION = "run"
-    OUTPUT_NODE = True  # Указываем, что узел выполняет действие, а не только вычисления
-    CATEGORY = "MVU/Utils"
-
-    def run(self, enabled: bool) -> Tuple[bool]:
-        """
-        Основной метод выполнения узла.
-        
-        Args:
-            enabled (bool): Состояние переключателя во входных параметрах.
-            
-        Returns:
-            Tuple[bool]: Возвращает состояние для дальнейшей передачи (pass-through).
-        """
-        logger.info(f"MVU VRAM Overlay Node executed. Enabled: {enabled}")
-
-        if enabled:
-            self.manager.start_overlay()
-        else:
-            self.manager.stop_overlay()
-
-        return (enabled,)
-
-
-# Регистрация классов (хотя в ComfyUI это делается обычно в __init__.py,
-# наличие этих словарей здесь полезно для прямой отладки или альтернативных загрузчиков)
-NODE_CLASS_MAPPINGS = {
-    "MVU_VramOverlay": MVU_VramOverlay
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "MVU_VramOverlay": "MVU VRAM Monitor"
+"""
+MVU VRAM Overlay Node for ComfyUI.
+
+Этот модуль содержит определение пользовательского узла (Custom Node) для ComfyUI,
+который управляет жизненным циклом внешнего процесса оверлея VRAM.
+
+Архитектура:
+- OverlayProcessManager (единственный экземпляр _MANAGER): Управляет subprocess (запуск/остановка).
+- MVU_VramOverlay (Node): Интерфейс для ComfyUI.
+
+Author: MVU
+License: MIT
+"""
+
+import os
+import sys
+import time
+import pathlib
+import subprocess
+import logging
+from typing import Optional, Tuple, Dict, Any
+
+# Настройка логгера для модуля
+logger = logging.getLogger("MVU.Nodes")
+
+
+class OverlayProcessManager:
+    """
+    Менеджер процесса оверлея.
+    Отвечает за запуск и остановку внешнего скрипта mvu_overlay_app.py.
+    Единственный экземпляр создается на уровне модуля (_MANAGER) —
+    это гарантирует один оверлей без прохода через __new__ на каждом
+    создании ноды.
+    """
+    _process: Optional[subprocess.Popen] = None
+
+    # Кэш состояния процесса: poll() — это waitpid-сисколл, поэтому
+    # перепроверяем реальное состояние не чаще раза в секунду.
+    _cached_alive: bool = False
+    _last_poll_mono: float = 0.0
+    _POLL_REVALIDATE_S: float = 1.0
+
+    # Путь к скрипту оверлея вычисляется один раз при загрузке модуля:
+    # start_overlay может вызываться на каждом прогоне workflow, и повторные
+    # join/exists — лишние stat-сисколлы.
+    _SCRIPT_PATH: pathlib.Path = pathlib.Path(__file__).parent / "mvu_overlay_app.py"
+    _SCRIPT_EXISTS: bool = _SCRIPT_PATH.is_file()
+
+    @property
+    def is_running(self) -> bool:
+        """Проверяет, запущен ли процесс и активен ли он."""
+        if self._process is None or not self._cached_alive:
+            return False
+
+        # В горячем пути отвечаем из кэша; настоящий poll() (waitpid)
+        # выполняем не чаще раза в _POLL_REVALIDATE_S.
+        now = time.monotonic()
+        if now - self._last_poll_mono >= self._POLL_REVALIDATE_S:
+            self._last_poll_mono = now
+            # poll() возвращает None, если процесс еще работает
+            if self._process.poll() is not None:
+                self._cached_alive = False
+
+        return self._cached_alive
+
+    def start_overlay(self) -> None:
+        """Запускает скрипт оверлея как подпроцесс."""
+        if self.is_running:
+            logger.info("Оверлей уже запущен. Пропуск запуска.")
+            return
+
+        if not self._SCRIPT_EXISTS:
+            logger.error("Файл скрипта не найден: %s", self._SCRIPT_PATH)
+            return
+
+        script_path = str(self._SCRIPT_PATH)
+        current_dir = str(self._SCRIPT_PATH.parent)
+
+        # Получаем PID текущего процесса (ComfyUI), чтобы передать его оверлею
+        current_pid = os.getpid()
+
+        # Используем тот же интерпретатор Python, который запустил ComfyUI.
+        # На Windows предпочитаем pythonw.exe — тогда консоль не выделяется
+        # вовсе, и оверлей не держит хэндл консоли ComfyUI.
+        interpreter = sys.executable
+        creationflags = 0
+        if sys.platform == "win32":
+            pythonw = os.path.join(os.path.dirname(sys.executable), "pythonw.exe")
+            if os.path.exists(pythonw):
+                interpreter = pythonw
+            creationflags = subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS
+
+        try:
+            cmd = [interpreter, script_path, "--pid", str(current_pid)]
+
+            # Запускаем процесс отсоединенным, без консольного окна и без
+            # I/O-каналов к родителю: оверлей живет своей жизнью, а его
+            # вывод не попадает в консоль ComfyUI.
+            self._process = subprocess.Popen(
+                cmd,
+                cwd=current_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=creationflags,
+            )
+            self._cached_alive = True
+            self._last_poll_mono = time.monotonic()
+            logger.info("Оверлей VRAM запущен (PID: %s)", self._process.pid)
+            
+        except OSError as e:
+            logger.error("Не удалось запустить процесс оверлея: %s", e)
+
+    def stop_overlay(self) -> None:
+        """Останавливает процесс оверлея."""
+        if self.is_running and self._process:
+            logger.info("Остановка оверлея...")
+            self._process.terminate()
+            try:
+                # Ждем корректного завершения 2 секунды
+                self._process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                logger.warning("Оверлей не ответил на terminate, принудительное завершение (kill).")
+                self._process.kill()
+            
+            self._process = None
+            self._cached_alive = False
+            logger.info("Оверлей остановлен.")
+        else:
+            logger.debug("Попытка остановки неактивного оверлея.")
+
+
+# Единственный на процесс менеджер: ComfyUI может пересоздавать ноды при
+# каждой перекомпиляции workflow, а менеджер должен жить дольше них.
+_MANAGER = OverlayProcessManager()
+
+
+class MVU_VramOverlay:
+    """
+    ComfyUI Node: MVU VRAM Overlay
+    
+    Узел управления отображением использования видеопамяти.
+    Позволяет включать и отключать оверлей прямо из workflow.
+    """
+
+    def __init__(self) -> None:
+        self.manager = _MANAGER
+
+    @classmethod
+    def INPUT_TYPES(cls) -> Dict[str, Any]:
+        """Определение входных параметров узла."""
+        return {
+            "required": {
+                "enabled": ("BOOLEAN", {"default": True, "label": "Enable Overlay"}),
+                # mode можно добавить в будущем для переключения стилей
+            }
+        }
+
+    RETURN_TYPES: Tuple[str] = ("BOOLEAN",)
+    RETURN_NAMES: Tuple[str] = ("enabled",)
+    FUNCTION = "run"
+    OUTPUT_NODE = True  # Указываем, что узел выполняет действие, а не только вычисления
+    CATEGORY = "MVU/Utils"
+
+    def run(self, enabled: bool) -> Tuple[bool]:
+        """
+        Основной метод выполнения узла.
+        
+        Args:
+            enabled (bool): Состояние переключателя во входных параметрах.
+            
+        Returns:
+            Tuple[bool]: Возвращает состояние для дальнейшей передачи (pass-through).
+        """
+        # DEBUG: срабатывает на каждом выполнении workflow, поэтому не INFO.
+        logger.debug("MVU VRAM Overlay Node executed. Enabled: %s", enabled)
+
+        if enabled:
+            self.manager.start_overlay()
+        else:
+            self.manager.stop_overlay()
+
+        return (enabled,)
+
+
+# Регистрация классов (хотя в ComfyUI это делается обычно в __init__.py,
+# наличие этих словарей здесь полезно для прямой отладки или альтернативных загрузчиков)
+NODE_CLASS_MAPPINGS = {
+    "MVU_VramOverlay": MVU_VramOverlay
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "MVU_VramOverlay": "MVU VRAM Monitor"
 }
\ No newline at end of file